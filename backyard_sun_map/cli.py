@@ -3,7 +3,7 @@ from zoneinfo import ZoneInfo
 
 import click
 
-from .plotting import plot_heatmap, plot_scene_overhead
+from .plotting import plot_heatmap, plot_heatmap_fast, plot_scene_overhead
 from .scene import load_scene
 from .simulation import run_simulation
 
@@ -50,6 +50,11 @@ def _parse_local_time(value: str, timezone: str) -> datetime:
     is_flag=True,
     help="Save overhead scene rendering for sanity checking.",
 )
+@click.option(
+    "--fast-plot",
+    is_flag=True,
+    help="Write the heatmap as a bare PNG via Pillow (no axes or colorbar).",
+)
 def main(
     scene_path: str,
     start: str,
@@ -59,6 +64,7 @@ def main(
     grid_resolution_ft: float,
     output_prefix: str,
     save_scene_overhead: bool,
+    fast_plot: bool,
 ) -> None:
     """Backyard sun exposure simulation."""
     scene = load_scene(scene_path)
@@ -79,7 +85,10 @@ def main(
     )
 
     heatmap_path = f"{output_prefix}_heatmap_{height_ft}ft.png"
-    plot_heatmap(x_grid, y_grid, exposure, heatmap_path)
+    if fast_plot:
+        plot_heatmap_fast(x_grid, y_grid, exposure, heatmap_path)
+    else:
+        plot_heatmap(x_grid, y_grid, exposure, heatmap_path)
     click.echo(f"Heatmap saved to {heatmap_path}")
 
     if save_scene_overhead:
@@ -1,102 +1,86 @@
-from dataclasses import dataclass
-from typing import List, Optional, Sequence, Tuple
+from dataclasses import dataclass, field
+from typing import List, Sequence
 
 import numpy as np
-from shapely.geometry import LineString, Point
+import shapely
+from shapely.affinity import translate
 
+from ._kernels import ray_shaded
 from .scene import Scene, SceneObject
 
 
-@dataclass
+@dataclass(slots=True)
 class InternalGeometry:
     objects: List[SceneObject]
+    # Geometry is feet-scale, so the kernel arrays are float32 throughout. They are all
+    # derived from ``objects``, which is what equality compares.
+    edges: np.ndarray = field(compare=False)  # (N_edges, 4) rows of x1, y1, x2, y2
+    edge_obj: np.ndarray = field(compare=False)  # (N_edges,) index of the owning object
+    heights: np.ndarray = field(compare=False)  # (N_objects,) object heights in feet
+    # (N_objects,) True where the footprint equals its convex hull
+    convex: np.ndarray = field(compare=False)
 
 
 def build_objects(scene: Scene) -> InternalGeometry:
-    """Adapter hook for future geometry processing."""
-    return InternalGeometry(objects=scene.objects)
-
-
-def _ray_intersection_distance(
-    geom,
-    origin: Tuple[float, float],
-    direction: Tuple[float, float],
-    max_dist: float = 1e6,
-) -> Optional[float]:
-    """Return distance s along ray origin + s*direction to first intersection."""
-    ox, oy = origin
-    dx, dy = direction
-    if abs(dx) < 1e-12 and abs(dy) < 1e-12:
-        # Straight up/down: only shaded if footprint contains origin.
-        if geom.contains(Point(ox, oy)):
-            return 0.0
-        return None
-
-    target = (ox + dx * max_dist, oy + dy * max_dist)
-    ray = LineString([origin, target])
-
-    boundary = geom.boundary if hasattr(geom, "boundary") else geom
-    intersection = boundary.intersection(ray)
-    if intersection.is_empty:
-        return None
-
-    points: List[Tuple[float, float]] = []
-    geom_type = intersection.geom_type
-    if geom_type == "Point":
-        px, py = intersection.x, intersection.y
-        points.append((px, py))
-    elif geom_type in ("MultiPoint", "GeometryCollection"):
-        for g in getattr(intersection, "geoms", []):
-            if g.geom_type == "Point":
-                points.append((g.x, g.y))
-    elif geom_type in ("LineString", "LinearRing"):
-        points.extend([(x, y) for x, y in intersection.coords])
-    elif geom_type == "MultiLineString":
-        for line in intersection.geoms:
-            points.extend([(x, y) for x, y in line.coords])
-
-    if not points:
-        return None
-
-    best: Optional[float] = None
-    for px, py in points:
-        if abs(dx) >= abs(dy):
-            if abs(dx) < 1e-12:
-                continue
-            s = (px - ox) / dx
-        else:
-            if abs(dy) < 1e-12:
-                continue
-            s = (py - oy) / dy
-        if s < 0:
-            continue
-        if best is None or s < best:
-            best = s
-    return best
+    """Flatten object boundaries into contiguous arrays for the shading kernels."""
+    edge_blocks = [obj.edges for obj in scene.objects]
+    if edge_blocks:
+        edges = np.ascontiguousarray(np.vstack(edge_blocks), dtype=np.float32)
+    else:
+        edges = np.empty((0, 4), dtype=np.float32)
+    edge_obj = np.repeat(
+        np.arange(len(edge_blocks), dtype=np.int64),
+        [len(block) for block in edge_blocks],
+    )
+    heights = np.array([obj.height_ft for obj in scene.objects], dtype=np.float32)
+    convex = np.array(
+        [
+            obj.geometry.convex_hull.area - obj.geometry.area <= 1e-9 * obj.geometry.area
+            for obj in scene.objects
+        ],
+        dtype=bool,
+    )
+    return InternalGeometry(
+        objects=scene.objects, edges=edges, edge_obj=edge_obj, heights=heights, convex=convex
+    )
+
+
+def shadow_polygon(obj: SceneObject, convex: bool, offset_x: float, offset_y: float):
+    """Return the region swept by the footprint moving from (0, 0) to (offset_x, offset_y).
+
+    For a sun direction (dx, dy, dz), an object of height h shades a point at height z
+    exactly when the point lies in its footprint swept by -(dx, dy) * (h - z) / dz.
+    """
+    geom = obj.geometry
+    moved = translate(geom, offset_x, offset_y)
+    if convex:
+        return shapely.union_all([geom, moved]).convex_hull
+    # A concave sweep also needs the parallelogram traced by each boundary edge.
+    edges = obj.edges
+    quads = np.stack(
+        [
+            edges[:, 0:2],
+            edges[:, 2:4],
+            edges[:, 2:4] + (offset_x, offset_y),
+            edges[:, 0:2] + (offset_x, offset_y),
+        ],
+        axis=1,
+    )
+    return shapely.union_all([geom, moved, *shapely.polygons(quads)])
 
 
 def is_point_shaded(
-    x: float | np.floating,
-    y: float | np.floating,
-    z_ft: float | np.floating,
+    x: float,
+    y: float,
+    z_ft: float,
     sun_dir: Sequence[float],
     geometry: InternalGeometry,
 ) -> bool:
-    """Return True if any object occludes the sun at this point."""
-    dx, dy, dz = (float(c) for c in sun_dir)
-    z_val = float(z_ft)
+    """Return True if any object occludes the sun at this point.
+
+    Inputs are passed to the kernel as-is; callers convert once, not per point.
+    """
+    dx, dy, dz = sun_dir
     if dz <= 0:
         return True
-
-    origin = (float(x), float(y))
-    ray_dir = (-dx, -dy)
-    for obj in geometry.objects:
-        if obj.geometry.contains(Point(origin)) and obj.height_ft >= z_val:
-            return True
-        s = _ray_intersection_distance(obj.geometry, origin, ray_dir)
-        if s is None:
-            continue
-        z_at_s = z_val - s * dz
-        if 0 <= z_at_s <= obj.height_ft:
-            return True
-    return False
+    return ray_shaded(x, y, z_ft, dx, dy, dz, geometry.edges, geometry.edge_obj, geometry.heights)
@@ -1,9 +1,15 @@
 import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib import colormaps
 from matplotlib.patches import Polygon as MplPolygon
+from PIL import Image
 from shapely.geometry import Polygon
 
 from .scene import Scene, SceneObject
 
+# 256-entry RGB lookup table matching the "inferno" colormap used by plot_heatmap.
+_INFERNO_LUT = np.round(colormaps["inferno"](np.arange(256))[:, :3] * 255).astype(np.uint8)
+
 
 def plot_heatmap(x_grid, y_grid, exposure, output_path: str):
     fig, ax = plt.subplots(figsize=(8, 6))
@@ -25,6 +31,16 @@ def plot_heatmap(x_grid, y_grid, exposure, output_path: str):
     plt.close(fig)
 
 
+def plot_heatmap_fast(x_grid, y_grid, exposure, output_path: str):
+    """Write the heatmap as a bare one-pixel-per-cell PNG, skipping the Matplotlib figure."""
+    peak = float(exposure.max()) if exposure.size else 0.0
+    scale = 255.0 / peak if peak > 0 else 0.0
+    norm = (exposure * scale).astype(np.uint8)
+    rgb = _INFERNO_LUT[norm]
+    # Row 0 is y_grid[0]; flip so north is up like plot_heatmap's origin="lower".
+    Image.fromarray(rgb[::-1]).save(output_path)
+
+
 def _draw_object(ax, obj: SceneObject):
     geom = obj.geometry
     if isinstance(geom, Polygon):
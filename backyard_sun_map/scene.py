@@ -3,20 +3,22 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+import numpy as np
+import shapely
 import yaml
 from shapely.geometry import CAP_STYLE, JOIN_STYLE, LineString, Point, Polygon
 
 FENCE_HALF_THICKNESS_FT = 0.164  # ~2 inch thickness treated as thin vertical surface
 
 
-@dataclass
+@dataclass(slots=True)
 class Location:
     latitude: float
     longitude: float
     timezone: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Bounds:
     x_min: Optional[float] = None
     x_max: Optional[float] = None
@@ -25,16 +27,47 @@ class Bounds:
     padding_ft: float = 6.56
 
 
-@dataclass
+def flatten_rings(geom) -> Tuple[np.ndarray, np.ndarray]:
+    """Flatten the polygon rings of ``geom`` into (M, 2) coords and (R + 1,) ring offsets.
+
+    Ring r spans rows ring_starts[r]:ring_starts[r + 1]; rings keep their closing vertex.
+    """
+    rings = []
+    for part in shapely.get_parts(geom):
+        if not isinstance(part, Polygon):
+            continue
+        rings.append(np.asarray(part.exterior.coords)[:, :2])
+        rings.extend(np.asarray(interior.coords)[:, :2] for interior in part.interiors)
+    ring_starts = np.zeros(len(rings) + 1, dtype=np.int64)
+    ring_starts[1:] = np.cumsum([len(ring) for ring in rings])
+    if not rings:
+        return np.empty((0, 2), dtype=np.float64), ring_starts
+    return np.ascontiguousarray(np.vstack(rings), dtype=np.float64), ring_starts
+
+
+def ring_edges(rings_xy: np.ndarray, ring_starts: np.ndarray) -> np.ndarray:
+    """Return the segments of flattened rings as (N, 4) rows of x1, y1, x2, y2."""
+    segments = [np.hstack([ring[:-1], ring[1:]]) for ring in np.split(rings_xy, ring_starts[1:-1])]
+    return np.ascontiguousarray(np.vstack(segments), dtype=np.float64)
+
+
+@dataclass(slots=True)
 class SceneObject:
     type: str
     name: str
     height_ft: float
     geometry: Any
     raw: Dict[str, Any] = field(default_factory=dict)
+    rings_xy: np.ndarray = field(init=False, repr=False, compare=False)
+    ring_starts: np.ndarray = field(init=False, repr=False, compare=False)
+    edges: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.rings_xy, self.ring_starts = flatten_rings(self.geometry)
+        self.edges = ring_edges(self.rings_xy, self.ring_starts)
 
 
-@dataclass
+@dataclass(slots=True)
 class Scene:
     location: Location
     orientation_deg_cw_from_north: float
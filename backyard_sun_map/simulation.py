@@ -1,12 +1,47 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Tuple
+from functools import lru_cache
+from typing import List, Sequence, Tuple
 
 import numpy as np
 
-from .geometry import build_objects, is_point_shaded
-from .scene import Scene
-from .solar import compute_solar_positions, generate_times, sun_vector_local
+from ._kernels import points_in_polys, warm_up
+from .geometry import build_objects, shadow_polygon
+from .scene import Scene, flatten_rings
+from .solar import compute_sun_dirs, generate_times
+
+CHUNK_CACHE_BYTES = 256 * 1024
+SUN_DIR_QUANTUM = 1e-3
+SHADOW_CACHE_SIZE = 128
+TIMESTEP_BATCH = 64
+
+
+def _chunk_cells() -> int:
+    """Number of cells whose accumulator and in-flight lit mask fit in CHUNK_CACHE_BYTES."""
+    # Per cell: 4 bytes of float32 accumulator, plus the one mask live at a time in
+    # _shade_one, a bool ``shaded`` byte and the uint8 lit byte derived from it.
+    bytes_per_cell = 4 + 1 + 1
+    return max(256, CHUNK_CACHE_BYTES // bytes_per_cell)
+
+
+def _shade_one(
+    shadows: Sequence[Tuple[np.ndarray, np.ndarray, float, float]],
+    xs: np.ndarray,
+    ys: np.ndarray,
+) -> np.ndarray:
+    """Return 1 (uint8) where a cell lies outside every flattened shadow polygon, else 0.
+
+    Cells must be in row-major grid order so ``ys`` is sorted; each shadow is then only
+    tested against the contiguous run of cells inside its y extent.
+    """
+    shaded = np.zeros(xs.size, dtype=bool)
+    for rings_xy, ring_starts, y_min, y_max in shadows:
+        lo = int(np.searchsorted(ys, y_min, side="left"))
+        hi = int(np.searchsorted(ys, y_max, side="right"))
+        if lo < hi:
+            points_in_polys(xs[lo:hi], ys[lo:hi], rings_xy, ring_starts, shaded[lo:hi])
+    return (~shaded).view(np.uint8)
 
 
 def run_simulation(
@@ -20,25 +55,110 @@ def run_simulation(
 ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """Run sun/shade simulation using feet units. Returns x_grid, y_grid, exposure_minutes."""
     objects = build_objects(scene)
+    warm_up()
     x_min, x_max, y_min, y_max = scene.resolved_bounds()
 
-    x_grid = np.arange(x_min, x_max + grid_res_ft, grid_res_ft)
-    y_grid = np.arange(y_min, y_max + grid_res_ft, grid_res_ft)
-    exposure = np.zeros((len(y_grid), len(x_grid)), dtype=float)
+    x_grid = np.arange(x_min, x_max + grid_res_ft, grid_res_ft).astype(np.float32)
+    y_grid = np.arange(y_min, y_max + grid_res_ft, grid_res_ft).astype(np.float32)
+    exposure = np.zeros((len(y_grid), len(x_grid)), dtype=np.float32)
+    z = np.float32(height_ft)
 
     times = generate_times(start, end, step_minutes, scene.location.timezone)
-    positions = compute_solar_positions(scene, times)
+    sun_dirs = compute_sun_dirs(scene, times)
+    sun_dirs = sun_dirs[sun_dirs[:, 2] > 0].astype(np.float32)
+
+    # Quantize directions so repeated sun positions (e.g. the same season across several
+    # days) reuse shadows. Barely-risen suns must stay above the horizon after rounding.
+    # Rounding moves shadow edges slightly, so cells on an edge can gain or lose a step
+    # relative to exact directions even when nothing is ever served from the caches.
+    sun_keys = np.round(sun_dirs / SUN_DIR_QUANTUM).astype(np.int64)
+    sun_keys[:, 2] = np.maximum(sun_keys[:, 2], 1)
+
+    # Only objects at least z tall can shade the evaluation plane; pull out what the
+    # shadow builder needs once instead of re-reading object attributes per direction.
+    casters = [
+        (obj, bool(convex), float(height - z))
+        for obj, convex, height in zip(objects.objects, objects.convex, objects.heights)
+        if height >= z
+    ]
 
-    for position in positions:
-        if position.alt_deg <= 0:
-            continue
-        sun_dir = sun_vector_local(
-            position.alt_deg, position.az_deg, scene.orientation_deg_cw_from_north
+    @lru_cache(maxsize=SHADOW_CACHE_SIZE)
+    def step_shadows(
+        dx_q: int, dy_q: int, dz_q: int
+    ) -> Tuple[Tuple[np.ndarray, np.ndarray, float, float], ...]:
+        """Flattened swept footprints for one quantized sun direction.
+
+        Each entry is (rings_xy, ring_starts, y_min, y_max); the y extent is that of the
+        swept bounding box, bbox(footprint) | bbox(translated footprint).
+        """
+        dx, dy, dz = (np.float32(c * SUN_DIR_QUANTUM) for c in (dx_q, dy_q, dz_q))
+        shadows = []
+        for obj, convex, rise in casters:
+            reach = rise / dz
+            shadow = shadow_polygon(obj, convex, float(-dx * reach), float(-dy * reach))
+            rings_xy, ring_starts = flatten_rings(shadow)
+            rings_xy = rings_xy.astype(np.float32)
+            y_min, y_max = float(rings_xy[:, 1].min()), float(rings_xy[:, 1].max())
+            shadows.append((rings_xy, ring_starts, y_min, y_max))
+        return tuple(shadows)
+
+    XX, YY = np.meshgrid(x_grid, y_grid)
+    xs = XX.ravel()
+    ys = YY.ravel()
+    flat_exposure = exposure.reshape(-1)
+
+    # No shadow reaches farther from its footprint than the run's longest horizontal
+    # shadow, so cells outside that envelope are lit at every step. Footprints at least
+    # z tall are shaded at every step. Only the cells in between go through the time loop.
+    in_envelope = np.zeros(xs.size, dtype=bool)
+    never_lit = np.zeros(xs.size, dtype=bool)
+    if len(sun_keys):
+        max_slope = float(np.max(np.hypot(sun_keys[:, 0], sun_keys[:, 1]) / sun_keys[:, 2]))
+        for obj, _, rise in casters:
+            points_in_polys(xs, ys, obj.rings_xy.astype(np.float32), obj.ring_starts, never_lit)
+            # Pad the reach: buffer() inscribes its arcs inside the true circle.
+            reach_ft = rise * max_slope * 1.01 + 1e-3
+            envelope_xy, envelope_starts = flatten_rings(obj.geometry.buffer(reach_ft))
+            points_in_polys(xs, ys, envelope_xy.astype(np.float32), envelope_starts, in_envelope)
+    flat_exposure[~in_envelope] = step_minutes * len(sun_keys)
+    maybe_idx = np.flatnonzero(in_envelope & ~never_lit)
+    maybe_xs = xs[maybe_idx]
+    maybe_ys = ys[maybe_idx]
+
+    # Timesteps are independent, so batches of them run on a thread pool; the shading
+    # kernel releases the GIL. Batches are small enough to give every worker one.
+    n_workers = os.cpu_count() or 1
+    batch = max(1, min(TIMESTEP_BATCH, -(-len(sun_keys) // n_workers)))
+    chunk = _chunk_cells()
+    n_chunks = max(1, -(-len(maybe_idx) // chunk))
+
+    # Masks are cached per chunk, so keep SHADOW_CACHE_SIZE directions' worth of every
+    # chunk; a smaller cache evicts each direction before it can repeat.
+    @lru_cache(maxsize=SHADOW_CACHE_SIZE * n_chunks)
+    def build_lit_mask(dx_q: int, dy_q: int, dz_q: int, c0: int) -> np.ndarray:
+        """Lit flags (uint8) for the chunk of cells starting at c0 for one sun direction."""
+        return _shade_one(
+            step_shadows(dx_q, dy_q, dz_q), maybe_xs[c0 : c0 + chunk], maybe_ys[c0 : c0 + chunk]
         )
-        for yi, y in enumerate(y_grid):
-            for xi, x in enumerate(x_grid):
-                if not is_point_shaded(x, y, height_ft, sun_dir, objects):
-                    exposure[yi, xi] += step_minutes
+
+    def shade_batch(batch_keys: List[List[int]]) -> np.ndarray:
+        """Count of lit timesteps per maybe-cell over one batch of timesteps."""
+        lit_steps = np.zeros(len(maybe_idx), dtype=np.float32)
+        # Sweep the batch over one chunk of cells before moving on, so the chunk's
+        # accumulator stays cache-resident while each step's mask is added into it.
+        for c0 in range(0, len(maybe_idx), chunk):
+            accum = lit_steps[c0 : c0 + chunk]
+            for dx_q, dy_q, dz_q in batch_keys:
+                accum += build_lit_mask(dx_q, dy_q, dz_q, c0)
+        return lit_steps
+
+    key_list = sun_keys.tolist()
+    batches = [key_list[i : i + batch] for i in range(0, len(key_list), batch)]
+    maybe_lit_steps = np.zeros(len(maybe_idx), dtype=np.float32)
+    with ThreadPoolExecutor(max_workers=n_workers) as pool:
+        for lit_steps in pool.map(shade_batch, batches):
+            maybe_lit_steps += lit_steps
+    flat_exposure[maybe_idx] = step_minutes * maybe_lit_steps
 
     # Ensure output directories exist
     output_dir = os.path.dirname(output_prefix)
@@ -1,14 +1,18 @@
 from dataclasses import dataclass
-from datetime import datetime, timedelta
-from typing import List, Sequence
+from datetime import datetime
+from typing import List, Sequence, Tuple, Union
 from zoneinfo import ZoneInfo
 
 import numpy as np
+import pandas as pd
 
 from .scene import Scene
 
+# generate_times returns a DatetimeIndex; plain datetime sequences are accepted too.
+Times = Union[pd.DatetimeIndex, Sequence[datetime]]
 
-@dataclass
+
+@dataclass(slots=True)
 class SunPosition:
     alt_deg: float
     az_deg: float
@@ -16,7 +20,7 @@ class SunPosition:
 
 def generate_times(
     start_dt: datetime, end_dt: datetime, step_minutes: int, timezone: str
-) -> List[datetime]:
+) -> pd.DatetimeIndex:
     if step_minutes <= 0:
         raise ValueError("step_minutes must be positive.")
 
@@ -29,17 +33,12 @@ def generate_times(
     if start_dt > end_dt:
         raise ValueError("start must be before end.")
 
-    times: List[datetime] = []
-    current = start_dt
-    delta = timedelta(minutes=step_minutes)
-    while current <= end_dt:
-        times.append(current)
-        current += delta
-    return times
+    return pd.date_range(
+        start_dt.astimezone(tzinfo), end_dt.astimezone(tzinfo), freq=f"{step_minutes}min"
+    )
 
 
-def _compute_with_pvlib(scene: Scene, times: Sequence[datetime]) -> List[SunPosition]:
-    import pandas as pd
+def _compute_with_pvlib(scene: Scene, times: Times) -> Tuple[np.ndarray, np.ndarray]:
     from pvlib.location import Location
 
     location = Location(
@@ -47,26 +46,27 @@ def _compute_with_pvlib(scene: Scene, times: Sequence[datetime]) -> List[SunPosi
         scene.location.longitude,
         tz=scene.location.timezone,
     )
-    index: pd.DatetimeIndex = pd.DatetimeIndex(pd.to_datetime(list(times)))
+    # No copy when ``times`` already comes from generate_times.
+    index = pd.DatetimeIndex(times)
     solpos = location.get_solarposition(index)
     altitudes = np.asarray(solpos["apparent_elevation"], dtype=float)
     azimuths = np.asarray(solpos["azimuth"], dtype=float)
-    return [SunPosition(float(a), float(z)) for a, z in zip(altitudes, azimuths)]
+    return altitudes, azimuths
 
 
-def _compute_with_pysolar(scene: Scene, times: Sequence[datetime]) -> List[SunPosition]:
+def _compute_with_pysolar(scene: Scene, times: Times) -> Tuple[np.ndarray, np.ndarray]:
     from pysolar.solar import get_altitude, get_azimuth
 
-    positions: List[SunPosition] = []
-    for t in times:
-        alt = get_altitude(scene.location.latitude, scene.location.longitude, t)
-        az = get_azimuth(scene.location.latitude, scene.location.longitude, t)
-        positions.append(SunPosition(float(alt), float(az)))
-    return positions
+    altitudes = np.empty(len(times), dtype=float)
+    azimuths = np.empty(len(times), dtype=float)
+    for i, t in enumerate(times):
+        altitudes[i] = get_altitude(scene.location.latitude, scene.location.longitude, t)
+        azimuths[i] = get_azimuth(scene.location.latitude, scene.location.longitude, t)
+    return altitudes, azimuths
 
 
-def compute_solar_positions(scene: Scene, times: Sequence[datetime]) -> List[SunPosition]:
-    """Compute solar altitude and azimuth for each time."""
+def compute_solar_angles(scene: Scene, times: Times) -> Tuple[np.ndarray, np.ndarray]:
+    """Compute solar altitude and azimuth arrays (degrees) for the given times."""
     try:
         return _compute_with_pvlib(scene, times)
     except ImportError:
@@ -76,21 +76,44 @@ def compute_solar_positions(scene: Scene, times: Sequence[datetime]) -> List[Sun
             raise RuntimeError("pvlib or pysolar is required to compute solar positions.") from exc
 
 
-def sun_vector_local(alt_deg: float, az_deg: float, orientation_deg: float):
-    """Return (dx, dy, dz) direction from origin toward the sun in yard-local coords."""
-    alt_rad = np.radians(alt_deg)
-    az_rad = np.radians(az_deg)
+def compute_solar_positions(scene: Scene, times: Times) -> List[SunPosition]:
+    """Compute solar altitude and azimuth for each time."""
+    altitudes, azimuths = compute_solar_angles(scene, times)
+    return [SunPosition(float(a), float(z)) for a, z in zip(altitudes, azimuths)]
 
-    dx_world = np.sin(az_rad) * np.cos(alt_rad)  # east
-    dy_world = np.cos(az_rad) * np.cos(alt_rad)  # north
-    dz_world = np.sin(alt_rad)
 
+def compute_sun_dirs(scene: Scene, times: Times) -> np.ndarray:
+    """Return a (T, 3) array of yard-local directions toward the sun, one row per time."""
+    altitudes, azimuths = compute_solar_angles(scene, times)
+    return sun_vectors_local(altitudes, azimuths, scene.orientation_deg_cw_from_north)
+
+
+def sun_vectors_local(
+    alt_deg_arr: np.ndarray, az_deg_arr: np.ndarray, orientation_deg: float
+) -> np.ndarray:
+    """Return (T, 3) rows of (dx, dy, dz) toward the sun in yard-local coords."""
+    alt = np.radians(np.asarray(alt_deg_arr, dtype=float))
+    az = np.radians(np.asarray(az_deg_arr, dtype=float))
+
+    dx_world = np.sin(az) * np.cos(alt)  # east
+    dy_world = np.cos(az) * np.cos(alt)  # north
+    dz_world = np.sin(alt)
+
+    # Rows are the local x and y axes expressed in (east, north).
     theta = np.radians(orientation_deg)
-    x_dir_east = np.sin(theta)
-    x_dir_north = np.cos(theta)
-    y_dir_east = np.sin(theta - np.pi / 2)
-    y_dir_north = np.cos(theta - np.pi / 2)
+    rotation = np.array(
+        [
+            [np.sin(theta), np.cos(theta)],
+            [np.sin(theta - np.pi / 2), np.cos(theta - np.pi / 2)],
+        ]
+    )
+    local_xy = np.column_stack([dx_world, dy_world]) @ rotation.T
+    return np.column_stack([local_xy, dz_world])
+
 
-    dx_local = dx_world * x_dir_east + dy_world * x_dir_north
-    dy_local = dx_world * y_dir_east + dy_world * y_dir_north
+def sun_vector_local(alt_deg: float, az_deg: float, orientation_deg: float):
+    """Return (dx, dy, dz) direction from origin toward the sun in yard-local coords."""
+    dx_local, dy_local, dz_world = sun_vectors_local(
+        np.atleast_1d(alt_deg), np.atleast_1d(az_deg), orientation_deg
+    )[0]
     return dx_local, dy_local, dz_world